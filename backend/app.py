@@ -4,17 +4,22 @@ Flask Server for Tic-Tac-Toe Web UI
 Provides WebSocket API and serves React frontend
 """
 
-from flask import Flask, send_from_directory
-from flask_socketio import SocketIO, emit
+from flask import Flask, request, send_from_directory
+from flask_socketio import SocketIO, emit, join_room
 from flask_cors import CORS
 import os
 import time
-from threading import Thread
+import uuid
+from collections import OrderedDict
+from threading import RLock, Thread
 
 from game_controller import GameController
 from gpio_handler import GPIOHandler
-from config import SERVER_HOST, SERVER_PORT, DEBUG
-import wifi_indicator
+from hardware import SimulatedBackend
+from matchmaking import MatchmakingQueue, Player
+from rating import create_engine
+from config import (SERVER_HOST, SERVER_PORT, DEBUG, BOARDS, DEFAULT_ROOM, HARDWARE_BACKEND,
+                    RATING_ENGINE, RESULT_DISPLAY_TIME, PLAYER_EXPIRY)
 
 # Initialize Flask app
 app = Flask(__name__, static_folder='../frontend/build', static_url_path='')
@@ -24,79 +29,243 @@ app.config['SECRET_KEY'] = 'tic-tac-toe-secret-key'
 # Initialize SocketIO
 socketio = SocketIO(app, cors_allowed_origins="*")
 
-# Initialize game components
-game = GameController()
+# Initialize game components (one game per board room)
+games = {board['room']: GameController() for board in BOARDS}
+client_rooms = {}  # Socket.IO session id -> room
+
+# Players, ratings and matchmaking
+rating_engine = create_engine(RATING_ENGINE)
+match_queue = MatchmakingQueue()
+players = {}          # player id -> Player
+client_players = {}   # Socket.IO session id -> player id
+player_sids = {}      # player id -> Socket.IO session id
+matches = {}          # match room -> {'X': player id, 'O': player id}
+player_rooms = {}     # player id -> match room, for players in a match
+detached = OrderedDict()  # player id -> time the player lost their session
+
+# Guards games, rooms, players and matches, which are shared between
+# Socket.IO handlers, the button poll thread and the delayed-reset threads
+state_lock = RLock()
 
 # Initialize GPIO handler immediately (not waiting for client connection)
 gpio = None
 wifi_led = None
 try:
     print("Initializing GPIO handler...")
-    gpio = GPIOHandler(button_callback=lambda pos: on_button_press(pos))
-    gpio.set_turn_indicator('X')
+    gpio = GPIOHandler(button_callback=lambda room, pos: on_button_press(room, pos))
+    for room in games:
+        gpio.set_turn_indicator(room, 'X')
     print("GPIO handler initialized successfully!")
     
-    # Initialize WiFi status indicator
-    print("Initializing WiFi status indicator...")
-    wifi_led = wifi_indicator.initialize()
-    print("WiFi status indicator started!")
+    # Initialize WiFi status indicator (needs real GPIO)
+    if HARDWARE_BACKEND == 'gpio':
+        print("Initializing WiFi status indicator...")
+        import wifi_indicator
+        wifi_led = wifi_indicator.initialize()
+        print("WiFi status indicator started!")
 except Exception as e:
     print(f"Warning: Could not initialize GPIO: {e}")
     print("GPIO buttons will not work, but web interface will still function")
-    # Create a dummy GPIO handler for testing
-    gpio = type('DummyGPIO', (), {
-        'set_turn_indicator': lambda self, p: print(f"LED: {p}"),
-        'flash_winner': lambda self, p: print(f"Flash: {p}"),
-        'turn_off_all_leds': lambda self: print("LEDs off"),
-        'cleanup': lambda self: None
-    })()
+    # Fall back to simulated hardware for testing
+    if gpio is None:
+        gpio = GPIOHandler(button_callback=lambda room, pos: on_button_press(room, pos),
+                           backend=SimulatedBackend())
 
 
-def on_button_press(position):
+def on_button_press(room, position):
     """
     Callback for physical button press.
     
     Args:
+        room: Room of the board the button belongs to
         position: Board position (0-8) that was pressed
     """
-    print(f"Physical button pressed at position {position}")
+    print(f"Physical button pressed on {room} at position {position}")
+    with state_lock:
+        apply_move(room, position)
+
+
+def apply_move(room, position):
+    """
+    Make a move in a room's game and broadcast the result.
+    
+    Must be called with state_lock held.
+    
+    Args:
+        room: Room whose game the move is for
+        position: Board position (0-8)
+    """
+    game = games[room]
     
     # Make the move
     result = game.make_move(position)
     
     if result is None:
         # Invalid move
-        socketio.emit('invalid_move', {'position': position})
+        socketio.emit('invalid_move', {'position': position}, to=room)
         return
     
-    # Update turn indicator LED
-    if result['game_over']:
-        if result['winner']:
+    # Update turn indicator LED (only rooms with a physical board)
+    if room in gpio.rooms:
+        if result['game_over'] and result['winner']:
             # Flash winner's LED in a separate thread
             def flash_led():
                 time.sleep(0.5)  # Small delay before flashing
-                gpio.flash_winner(result['winner'])
+                gpio.flash_winner(room, result['winner'])
             Thread(target=flash_led, daemon=True).start()
-        else:
+        elif result['game_over']:
             # Draw - turn off both LEDs
-            gpio.turn_off_all_leds()
-    else:
-        # Set LED for next player
-        gpio.set_turn_indicator(result['next_player'])
+            gpio.turn_off_all_leds(room)
+        else:
+            # Set LED for next player
+            gpio.set_turn_indicator(room, result['next_player'])
+    
+    # Broadcast move to all clients watching this board
+    socketio.emit('move_made', result, to=room)
     
-    # Broadcast move to all connected clients
-    socketio.emit('move_made', result)
+    # Rated matches end after one game
+    if result['game_over'] and room in matches:
+        finish_match(room, result['winner'])
     
     # Auto-reset after game over
-    if result['game_over']:
+    elif result['game_over']:
         def reset_game():
-            time.sleep(3)  # Wait 3 seconds before reset
-            game.reset_game()
-            gpio.set_turn_indicator('X')
-            socketio.emit('game_reset', game.get_game_state())
+            time.sleep(RESULT_DISPLAY_TIME)  # Show the result before reset
+            with state_lock:
+                game.reset_game()
+                gpio.set_turn_indicator(room, 'X')
+                socketio.emit('game_reset', game.get_game_state(), to=room)
         Thread(target=reset_game, daemon=True).start()
 
 
+def finish_match(room, winner):
+    """
+    Rate both players of a finished match and close its room.
+    
+    Must be called with state_lock held.
+    
+    Args:
+        room: Match room
+        winner: 'X', 'O', or None for a draw
+    """
+    match = matches.pop(room)
+    for player_id in match.values():
+        del player_rooms[player_id]
+    player_x, player_o = players[match['X']], players[match['O']]
+    score_x = {'X': 1, 'O': 0, None: 0.5}[winner]
+    player_x.rating, player_o.rating = rating_engine.rate(player_x.rating, player_o.rating, score_x)
+    print(f"Match {room} finished: {player_x.name} {player_x.rating.to_dict()['rating']}, "
+          f"{player_o.name} {player_o.rating.to_dict()['rating']}")
+    
+    socketio.emit('match_ended', {
+        'room': room,
+        'winner': winner,
+        'players': {'X': player_x.to_dict(), 'O': player_o.to_dict()},
+    }, to=room)
+    
+    # Send players back to the default board after showing the result
+    def close_match():
+        time.sleep(RESULT_DISPLAY_TIME)  # Show the result, like the board auto-reset
+        with state_lock:
+            for player_id in match.values():
+                sid = player_sids.get(player_id)
+                if sid is not None and client_rooms.get(sid) == room:
+                    move_client(sid, DEFAULT_ROOM)
+                    socketio.emit('game_state', games[DEFAULT_ROOM].get_game_state(), to=sid)
+            games.pop(room, None)
+    Thread(target=close_match, daemon=True).start()
+
+
+def start_match(player_x, player_o):
+    """
+    Create a game room for two matched players.
+    
+    Must be called with state_lock held.
+    
+    Args:
+        player_x: Player who moves first
+        player_o: Player who moves second
+    """
+    room = f"match-{uuid.uuid4().hex[:8]}"
+    games[room] = GameController()
+    matches[room] = {'X': player_x.id, 'O': player_o.id}
+    player_rooms[player_x.id] = player_rooms[player_o.id] = room
+    print(f"Match {room}: {player_x.name} (X) vs {player_o.name} (O)")
+    
+    for player in (player_x, player_o):
+        move_client(player_sids[player.id], room)
+        socketio.emit('match_found', match_info(room, player.id), to=player_sids[player.id])
+    socketio.emit('game_state', games[room].get_game_state(), to=room)
+
+
+def match_info(room, player_id):
+    """
+    Describe a match from one player's point of view.
+    
+    Args:
+        room: Match room
+        player_id: Private id of the player the info is for
+    """
+    match = matches[room]
+    return {
+        'room': room,
+        'symbol': 'X' if match['X'] == player_id else 'O',
+        'players': {symbol: players[pid].to_dict() for symbol, pid in match.items()},
+    }
+
+
+def move_client(sid, room):
+    """
+    Move a client from its current room into another one.
+    
+    Uses the Socket.IO server directly so it also works from background
+    threads, which have no Flask app context.
+    """
+    socketio.server.leave_room(sid, client_rooms[sid], namespace='/')
+    client_rooms[sid] = room
+    socketio.server.enter_room(sid, room, namespace='/')
+
+
+def detach_player(sid):
+    """
+    Drop the player identity attached to a connection.
+    
+    The player is only dequeued (and forfeits a running match) if this
+    connection is their current session; older tabs just let go.
+    Must be called with state_lock held.
+    """
+    player_id = client_players.pop(sid, None)
+    if player_id is None or player_sids.get(player_id) != sid:
+        return
+    
+    del player_sids[player_id]
+    match_queue.remove(player_id)
+    
+    # Leaving a match forfeits it
+    room = player_rooms.get(player_id)
+    if room is not None:
+        finish_match(room, 'O' if matches[room]['X'] == player_id else 'X')
+    
+    # Keep the rating around for a while so a reload can reclaim it
+    detached[player_id] = time.time()
+    expire_players()
+
+
+def expire_players():
+    """
+    Forget players who have had no session for PLAYER_EXPIRY seconds.
+    
+    Must be called with state_lock held.
+    """
+    cutoff = time.time() - PLAYER_EXPIRY
+    while detached:
+        player_id, since = next(iter(detached.items()))
+        if since > cutoff:
+            break
+        del detached[player_id]
+        del players[player_id]
+
+
 @app.route('/')
 def serve_frontend():
     """Serve the React frontend."""
@@ -115,56 +284,159 @@ def serve_static(path):
 @socketio.on('connect')
 def handle_connect():
     """Handle client connection."""
-    global gpio
-    
     print('Client connected')
     
-    # Initialize GPIO handler on first connection
-    if gpio is None:
-        try:
-            gpio = GPIOHandler(button_callback=on_button_press)
-            gpio.set_turn_indicator('X')
-        except Exception as e:
-            print(f"Warning: Could not initialize GPIO (not on Raspberry Pi?): {e}")
-            # Create a dummy GPIO handler for testing
-            gpio = type('DummyGPIO', (), {
-                'set_turn_indicator': lambda self, p: print(f"LED: {p}"),
-                'flash_winner': lambda self, p: print(f"Flash: {p}"),
-                'turn_off_all_leds': lambda self: print("LEDs off"),
-                'cleanup': lambda self: None
-            })()
-    
-    # Send current game state to the newly connected client
-    emit('game_state', game.get_game_state())
+    # Watch the default board until the client picks another one
+    with state_lock:
+        client_rooms[request.sid] = DEFAULT_ROOM
+        join_room(DEFAULT_ROOM)
+        
+        # Send current game state to the newly connected client
+        emit('game_state', games[DEFAULT_ROOM].get_game_state())
 
 
 @socketio.on('disconnect')
 def handle_disconnect():
     """Handle client disconnection."""
     print('Client disconnected')
+    with state_lock:
+        detach_player(request.sid)
+        client_rooms.pop(request.sid, None)
+
+
+@socketio.on('register_player')
+def handle_register_player(data):
+    """Attach a player identity to this connection."""
+    data = data or {}
+    
+    with state_lock:
+        expire_players()
+        
+        # Only ids issued by this server are accepted; anything else is a new player
+        player = players.get(data.get('player_id'))
+        if player is None:
+            player = Player(data.get('name') or 'Player')
+            players[player.id] = player
+        elif data.get('name'):
+            player.name = data['name']
+        
+        if client_players.get(request.sid) != player.id:
+            detach_player(request.sid)
+        detached.pop(player.id, None)
+        
+        # The newest session takes over the player from any other tab
+        old_sid = player_sids.get(player.id)
+        if old_sid is not None and old_sid != request.sid:
+            client_players.pop(old_sid, None)
+            emit('session_replaced', to=old_sid)
+            room = player_rooms.get(player.id)
+            if room is not None and client_rooms.get(old_sid) == room:
+                move_client(old_sid, DEFAULT_ROOM)
+                move_client(request.sid, room)
+                emit('match_found', match_info(room, player.id))
+                emit('game_state', games[room].get_game_state())
+        
+        client_players[request.sid] = player.id
+        player_sids[player.id] = request.sid
+        print(f'Player registered: {player.name} ({player.public_id})')
+        
+        # The private id goes only to the player's own connection
+        emit('player_info', {**player.to_dict(), 'player_id': player.id})
+
+
+@socketio.on('find_match')
+def handle_find_match():
+    """Queue this client's player for a rated match."""
+    with state_lock:
+        player_id = client_players.get(request.sid)
+        if player_id is None:
+            emit('error', {'message': 'Register a player before finding a match'})
+            return
+        if player_id in player_rooms:
+            emit('error', {'message': 'Already in a match'})
+            return
+        
+        player = players[player_id]
+        opponent = match_queue.enqueue(player)
+        if opponent is None:
+            emit('queue_joined', {'waiting': len(match_queue)})
+        else:
+            # The player who waited longer moves first
+            start_match(opponent, player)
+
+
+@socketio.on('leave_queue')
+def handle_leave_queue():
+    """Remove this client's player from the matchmaking queue."""
+    with state_lock:
+        player_id = client_players.get(request.sid)
+    if player_id is not None and match_queue.remove(player_id):
+        emit('queue_left')
+
+
+@socketio.on('make_move')
+def handle_make_move(data):
+    """Handle a move from a player in a rated match."""
+    position = (data or {}).get('position')
+    with state_lock:
+        room = client_rooms[request.sid]
+        match = matches.get(room)
+        player_id = client_players.get(request.sid)
+        
+        # Web moves are only accepted from the player whose turn it is
+        if (match is None or not isinstance(position, int)
+                or match[games[room].current_player] != player_id):
+            emit('invalid_move', {'position': position})
+            return
+        
+        apply_move(room, position)
+
+
+@socketio.on('join_board')
+def handle_join_board(data):
+    """Handle request to watch a different board."""
+    room = (data or {}).get('room')
+    if room not in gpio.rooms:
+        emit('error', {'message': f"Unknown board: {room}"})
+        return
+    
+    with state_lock:
+        if client_players.get(request.sid) in player_rooms:
+            emit('error', {'message': 'Already in a match'})
+            return
+        
+        move_client(request.sid, room)
+        print(f'Client joined {room}')
+        emit('game_state', games[room].get_game_state())
 
 
 @socketio.on('reset_game')
 def handle_reset():
     """Handle game reset request from client."""
-    print('Game reset requested')
-    game.reset_game()
-    if gpio:
-        gpio.set_turn_indicator('X')
-    emit('game_reset', game.get_game_state())
+    with state_lock:
+        room = client_rooms[request.sid]
+        if room in matches:
+            emit('error', {'message': 'Rated matches cannot be reset'})
+            return
+        print(f'Game reset requested on {room}')
+        games[room].reset_game()
+        gpio.set_turn_indicator(room, 'X')
+        emit('game_reset', games[room].get_game_state(), to=room)
 
 
 @socketio.on('request_state')
 def handle_state_request():
     """Handle request for current game state."""
-    emit('game_state', game.get_game_state())
+    with state_lock:
+        emit('game_state', games[client_rooms[request.sid]].get_game_state())
 
 
 def cleanup():
     """Cleanup resources on shutdown."""
     if gpio:
         gpio.cleanup()
-    wifi_indicator.cleanup()
+    if wifi_led:
+        wifi_led.cleanup()
 
 
 if __name__ == '__main__':
@@ -34,6 +34,37 @@ TURN_LED_PINS = {
     'O': 20,  # Blue LED for Player O (GPIO20)
 }
 
+# Hardware Boards
+# ===============
+
+# Input/output backend: 'gpio' for real hardware, 'simulated' to run
+# without a Raspberry Pi (button presses can be injected from Python)
+HARDWARE_BACKEND = 'gpio'
+
+# Each physical board drives its own game room. 'scanner' selects how the
+# board's buttons are read:
+#   'gpio'              - Pi GPIO bank, read in one register access per poll
+#   'mcp23017:<bus>:<addr>' - MCP23017 port expander on I2C (pins 0-15 = GPA0-GPB7)
+# Boards that share a scanner are read together with a single bank read.
+BOARDS = [
+    {
+        'room': 'board-1',
+        'scanner': 'gpio',
+        'buttons': BUTTON_PINS,
+        'leds': TURN_LED_PINS,
+    },
+    # Example second board wired through a port expander:
+    # {
+    #     'room': 'board-2',
+    #     'scanner': 'mcp23017:1:0x20',
+    #     'buttons': {0: 0, 1: 1, 2: 2, 3: 3, 4: 4, 5: 5, 6: 6, 7: 7, 8: 8},
+    #     'leds': {'X': 5, 'O': 12},
+    # },
+]
+
+# Room that clients join when they don't ask for a specific board
+DEFAULT_ROOM = BOARDS[0]['room']
+
 # WiFi Status LED Pin
 WIFI_LED_PIN = 21  # Green LED for WiFi connection status
 
@@ -43,9 +74,35 @@ WIFI_LED_PIN = 21  # Green LED for WiFi connection status
 # Button debounce time in seconds
 BUTTON_DEBOUNCE = 0.2
 
+# Delay between input scans in seconds
+BUTTON_POLL_INTERVAL = 0.01
+
 # Game Configuration
 # ==================
 
 # Animation timing for LED flashing on win
 WIN_LED_FLASH_COUNT = 5
 WIN_LED_FLASH_DELAY = 0.2  # seconds
+
+# Time to show a finished game before the board resets (or a match closes)
+RESULT_DISPLAY_TIME = 3  # seconds
+
+# Ratings and Matchmaking
+# =======================
+
+# Rating engine: 'elo' or 'glicko'
+RATING_ENGINE = 'elo'
+ELO_K_FACTOR = 32
+
+# Glicko rating deviation added back before each game (the "c" constant);
+# 34.6 takes a settled RD of 50 back to 350 after about 100 idle games
+GLICKO_RD_INFLATION = 34.6
+
+# Forget players who have had no connection for this long (seconds)
+PLAYER_EXPIRY = 3600
+
+# Waiting players are indexed in buckets of this many rating points
+MATCH_BUCKET_SIZE = 50
+
+# Largest rating difference allowed between matched players
+MATCH_MAX_SPREAD = 200
@@ -1,118 +1,167 @@
 """
 GPIO Handler for Tic-Tac-Toe Web UI
-Manages button inputs and turn indicator LEDs
+Manages button inputs and turn indicator LEDs for one or more boards
 """
 
-import RPi.GPIO as GPIO
+import threading
 import time
-from config import BUTTON_PINS, TURN_LED_PINS, BUTTON_DEBOUNCE, WIN_LED_FLASH_COUNT, WIN_LED_FLASH_DELAY
+from config import (BOARDS, HARDWARE_BACKEND, BUTTON_DEBOUNCE, BUTTON_POLL_INTERVAL,
+                    WIN_LED_FLASH_COUNT, WIN_LED_FLASH_DELAY)
+from hardware import create_backend
 
 
 class GPIOHandler:
-    """Manages GPIO operations for buttons and LEDs."""
-    
-    def __init__(self, button_callback=None):
+    """Manages GPIO operations for buttons and LEDs across all boards."""
+
+    def __init__(self, button_callback=None, boards=BOARDS, backend=None):
         """
         Initialize GPIO handler.
-        
+
         Args:
-            button_callback: Function to call when button is pressed (receives position)
+            button_callback: Function to call when button is pressed (receives room, position)
+            boards: List of board configs (see config.BOARDS)
+            backend: Hardware backend; defaults to config.HARDWARE_BACKEND
         """
         self.button_callback = button_callback
-        self.last_press_time = {}
-        
-        # Set up GPIO
-        GPIO.setmode(GPIO.BCM)
-        GPIO.setwarnings(False)
-        
-        # Configure button pins as inputs with pull-up resistors
-        for position, pin in BUTTON_PINS.items():
-            GPIO.setup(pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-            self.last_press_time[position] = 0
-        
+        self.backend = backend or create_backend(HARDWARE_BACKEND)
+        self.led_pins = {}
+
+        # Group buttons by scanner so each bank is read once per poll,
+        # however many boards are wired to it
+        self.scanners = {}   # scanner spec -> InputScanner
+        self.lines = {}      # scanner spec -> {line: (room, position)}
+        for board in boards:
+            room, spec = board['room'], board['scanner']
+            if spec not in self.scanners:
+                self.scanners[spec] = self.backend.create_scanner(spec)
+                self.lines[spec] = {}
+            for position, line in board['buttons'].items():
+                if line in self.lines[spec]:
+                    raise ValueError(f"Line {line} on scanner '{spec}' is assigned twice")
+                self.lines[spec][line] = (room, position)
+            self.scanners[spec].setup(board['buttons'].values())
+
+            # Configure LED pins as outputs
+            self.led_pins[room] = board['leds']
+            for pin in board['leds'].values():
+                self.backend.setup_output(pin)  # Start with LEDs off
+
+        self.line_masks = {spec: sum(1 << line for line in lines)
+                           for spec, lines in self.lines.items()}
+        self.last_press_time = {spec: {line: 0 for line in lines}
+                                for spec, lines in self.lines.items()}
+
         # Start polling thread for button detection
-        self.button_states = {pos: GPIO.HIGH for pos in BUTTON_PINS.keys()}
+        self.button_states = {spec: self.line_masks[spec] for spec in self.scanners}
         self.running = True
-        import threading
         self.poll_thread = threading.Thread(target=self._poll_buttons, daemon=True)
         self.poll_thread.start()
-        
-        # Configure LED pins as outputs
-        for player, pin in TURN_LED_PINS.items():
-            GPIO.setup(pin, GPIO.OUT)
-            GPIO.output(pin, GPIO.LOW)  # Start with LEDs off
-        
-        print("GPIO handler initialized")
-    
+
+        print(f"GPIO handler initialized ({len(self.led_pins)} board(s), "
+              f"{len(self.scanners)} scanner(s))")
+
+    @property
+    def rooms(self):
+        """List of rooms that have a physical board."""
+        return list(self.led_pins)
+
     def _poll_buttons(self):
         """Poll button states in a loop (replaces edge detection)."""
         print("Button polling started")
         while self.running:
-            for position, pin in BUTTON_PINS.items():
-                current_state = GPIO.input(pin)
-                
-                # Button pressed when state goes from HIGH to LOW (pull-up resistor)
-                if self.button_states[position] == GPIO.HIGH and current_state == GPIO.LOW:
-                    # Check debounce
-                    current_time = time.time()
-                    if current_time - self.last_press_time[position] >= BUTTON_DEBOUNCE:
-                        self.last_press_time[position] = current_time
-                        print(f"[DEBUG] Button pressed: Position {position} (GPIO {pin})")
-                        
-                        # Call the user callback
-                        if self.button_callback:
-                            self.button_callback(position)
-                
-                # Update state
-                self.button_states[position] = current_state
-            
+            for spec, scanner in self.scanners.items():
+                self._scan(spec, scanner.read())
+
             # Small delay to avoid consuming too much CPU
-            time.sleep(0.01)  # Poll every 10ms
-    
-    def set_turn_indicator(self, player):
+            time.sleep(BUTTON_POLL_INTERVAL)
+
+    def _scan(self, spec, levels):
+        """
+        Dispatch presses found in one bank read.
+
+        Args:
+            spec: Scanner the levels were read from
+            levels: Bitmask of line levels (bit set = HIGH)
+        """
+        levels &= self.line_masks[spec]
+
+        # Button pressed when state goes from HIGH to LOW (pull-up resistor).
+        # Only lines that actually changed are visited.
+        pressed = self.button_states[spec] & ~levels
+        self.button_states[spec] = levels
+
+        while pressed:
+            bit = pressed & -pressed
+            pressed ^= bit
+            line = bit.bit_length() - 1
+            room, position = self.lines[spec][line]
+
+            # Check debounce
+            current_time = time.time()
+            if current_time - self.last_press_time[spec][line] < BUTTON_DEBOUNCE:
+                continue
+            self.last_press_time[spec][line] = current_time
+            print(f"[DEBUG] Button pressed: {room} position {position} ({spec} line {line})")
+
+            # Call the user callback
+            if self.button_callback:
+                self.button_callback(room, position)
+
+    def set_turn_indicator(self, room, player):
         """
         Set the turn indicator LED for the current player.
-        
+
         Args:
+            room: Board room name
             player: 'X' or 'O'
         """
-        if player == 'X':
-            # Turn on red LED, turn off blue LED
-            GPIO.output(TURN_LED_PINS['X'], GPIO.HIGH)
-            GPIO.output(TURN_LED_PINS['O'], GPIO.LOW)
-            print("Turn indicator: Player X (Red)")
-        elif player == 'O':
-            # Turn on blue LED, turn off red LED
-            GPIO.output(TURN_LED_PINS['X'], GPIO.LOW)
-            GPIO.output(TURN_LED_PINS['O'], GPIO.HIGH)
-            print("Turn indicator: Player O (Blue)")
-    
-    def flash_winner(self, player):
+        pins = self.led_pins.get(room)
+        if pins is None or player not in pins:
+            return
+
+        # Light the current player's LED, turn off the other one
+        for symbol, pin in pins.items():
+            self.backend.output(pin, symbol == player)
+        print(f"Turn indicator ({room}): Player {player}")
+
+    def flash_winner(self, room, player):
         """
         Flash the winning player's LED.
-        
+
         Args:
+            room: Board room name
             player: 'X' or 'O'
         """
-        pin = TURN_LED_PINS.get(player)
+        pin = self.led_pins.get(room, {}).get(player)
         if pin is None:
             return
-        
-        print(f"Flashing winner LED: Player {player}")
+
+        print(f"Flashing winner LED ({room}): Player {player}")
         for _ in range(WIN_LED_FLASH_COUNT):
-            GPIO.output(pin, GPIO.HIGH)
+            self.backend.output(pin, True)
             time.sleep(WIN_LED_FLASH_DELAY)
-            GPIO.output(pin, GPIO.LOW)
+            self.backend.output(pin, False)
             time.sleep(WIN_LED_FLASH_DELAY)
-    
-    def turn_off_all_leds(self):
-        """Turn off both indicator LEDs."""
-        for pin in TURN_LED_PINS.values():
-            GPIO.output(pin, GPIO.LOW)
-        print("Turn indicators off")
-    
+
+    def turn_off_all_leds(self, room=None):
+        """
+        Turn off indicator LEDs.
+
+        Args:
+            room: Board room name, or None for every board
+        """
+        rooms = self.led_pins if room is None else [room]
+        for name in rooms:
+            for pin in self.led_pins.get(name, {}).values():
+                self.backend.output(pin, False)
+        print(f"Turn indicators off ({room or 'all boards'})")
+
     def cleanup(self):
         """Clean up GPIO resources."""
         print("Cleaning up GPIO handler")
+        self.running = False
+        self.poll_thread.join(timeout=1)
         self.turn_off_all_leds()
-        GPIO.cleanup()
+        for scanner in self.scanners.values():
+            scanner.cleanup()
+        self.backend.cleanup()
@@ -0,0 +1,250 @@
+"""
+Hardware Backends for Tic-Tac-Toe Web UI
+Batched input scanners and LED outputs for real and simulated boards
+"""
+
+import mmap
+import struct
+import threading
+from abc import ABC, abstractmethod
+
+# BCM283x GPIO pin level register (GPLEV0, pins 0-31) offset in /dev/gpiomem
+GPLEV0_OFFSET = 0x34
+
+# MCP23017 registers (IOCON.BANK = 0, the power-on default)
+MCP23017_IODIRA = 0x00
+MCP23017_GPPUA = 0x0C
+MCP23017_GPIOA = 0x12
+
+# Scanner levels are bitmasks: bit N set = line N is HIGH (button released)
+ALL_HIGH = 0xFFFFFFFF
+
+
+class InputScanner(ABC):
+    """Reads a whole bank of input lines at once."""
+
+    @abstractmethod
+    def setup(self, pins):
+        """
+        Configure lines as pulled-up inputs.
+
+        Args:
+            pins: Iterable of line numbers on this scanner
+        """
+
+    @abstractmethod
+    def read(self):
+        """
+        Read the current level of every line in the bank.
+
+        Returns:
+            Bitmask of line levels (bit N set = line N is HIGH)
+        """
+
+    def cleanup(self):
+        """Release scanner resources."""
+
+
+class GPIOBankScanner(InputScanner):
+    """Reads Pi GPIO 0-31 with a single GPLEV0 register access."""
+
+    def __init__(self, gpio):
+        """
+        Initialize the bank scanner.
+
+        Args:
+            gpio: The RPi.GPIO module (used for pin setup and fallback reads)
+        """
+        self.gpio = gpio
+        self.pins = []
+        self._mem = None
+
+        try:
+            with open('/dev/gpiomem', 'r+b') as f:
+                self._mem = mmap.mmap(f.fileno(), 4096)
+        except OSError as e:
+            print(f"Warning: /dev/gpiomem unavailable ({e}), reading pins individually")
+
+    def setup(self, pins):
+        for pin in pins:
+            self.gpio.setup(pin, self.gpio.IN, pull_up_down=self.gpio.PUD_UP)
+            self.pins.append(pin)
+
+    def read(self):
+        if self._mem is not None:
+            return struct.unpack_from('<I', self._mem, GPLEV0_OFFSET)[0]
+
+        # Fallback: one GPIO.input call per configured pin
+        levels = ALL_HIGH
+        for pin in self.pins:
+            if self.gpio.input(pin) == self.gpio.LOW:
+                levels &= ~(1 << pin)
+        return levels
+
+    def cleanup(self):
+        if self._mem is not None:
+            self._mem.close()
+            self._mem = None
+
+
+class MCP23017Scanner(InputScanner):
+    """Reads all 16 lines of an MCP23017 port expander in one I2C transfer."""
+
+    def __init__(self, bus, address):
+        """
+        Initialize the port expander scanner.
+
+        Args:
+            bus: I2C bus number (1 on all modern Pi models)
+            address: I2C address of the expander (0x20-0x27)
+        """
+        from smbus2 import SMBus
+
+        self.address = address
+        self.bus = SMBus(bus)
+        self.input_mask = 0
+
+    def setup(self, pins):
+        for pin in pins:
+            if not 0 <= pin <= 15:
+                raise ValueError(f"MCP23017 pin out of range: {pin}")
+            self.input_mask |= 1 << pin
+
+        # IODIRA/B and GPPUA/B are adjacent, so each is a single word access.
+        # Only the button bits are set; other pins keep their direction and
+        # pull-up (a cleared IODIR bit would make a pin an output)
+        for register in (MCP23017_IODIRA, MCP23017_GPPUA):
+            value = self.bus.read_word_data(self.address, register)
+            self.bus.write_word_data(self.address, register, value | self.input_mask)
+
+    def read(self):
+        # GPIOA in the low byte, GPIOB in the high byte
+        return self.bus.read_word_data(self.address, MCP23017_GPIOA)
+
+    def cleanup(self):
+        self.bus.close()
+
+
+class SimulatedScanner(InputScanner):
+    """In-memory input bank; button presses are injected with press()/release()."""
+
+    def __init__(self):
+        """Initialize with every line released (HIGH)."""
+        self.levels = ALL_HIGH
+        self.pins = set()
+        self.read_count = 0
+        self._lock = threading.Lock()
+
+    def setup(self, pins):
+        self.pins.update(pins)
+
+    def press(self, pin):
+        """Pull a line LOW, as a pressed button would."""
+        with self._lock:
+            self.levels &= ~(1 << pin)
+
+    def release(self, pin):
+        """Let a line return HIGH."""
+        with self._lock:
+            self.levels |= 1 << pin
+
+    def read(self):
+        with self._lock:
+            self.read_count += 1
+            return self.levels
+
+
+class GPIOBackend:
+    """Real hardware: RPi.GPIO for LEDs, batched scanners for buttons."""
+
+    def __init__(self):
+        """Initialize the backend and set BCM pin numbering."""
+        import RPi.GPIO as GPIO
+
+        self.GPIO = GPIO
+        GPIO.setmode(GPIO.BCM)
+        GPIO.setwarnings(False)
+
+    def create_scanner(self, spec):
+        """
+        Create the scanner described by a board's 'scanner' setting.
+
+        Args:
+            spec: 'gpio' or 'mcp23017:<bus>:<addr>'
+
+        Returns:
+            InputScanner instance
+        """
+        kind, _, params = spec.partition(':')
+        if kind == 'gpio':
+            return GPIOBankScanner(self.GPIO)
+        if kind == 'mcp23017':
+            bus, _, address = params.partition(':')
+            return MCP23017Scanner(int(bus), int(address, 0))
+        raise ValueError(f"Unknown scanner: {spec}")
+
+    def setup_output(self, pin):
+        """Configure an LED pin as an output, initially off."""
+        self.GPIO.setup(pin, self.GPIO.OUT)
+        self.GPIO.output(pin, self.GPIO.LOW)
+
+    def output(self, pin, on):
+        """Drive an LED pin on or off."""
+        self.GPIO.output(pin, self.GPIO.HIGH if on else self.GPIO.LOW)
+
+    def cleanup(self):
+        """Release all GPIO pins."""
+        self.GPIO.cleanup()
+
+
+class SimulatedBackend:
+    """Hardware-free backend for development and testing."""
+
+    def __init__(self):
+        """Initialize with no scanners and all LEDs off."""
+        self.scanners = {}
+        self.leds = {}
+
+    def create_scanner(self, spec):
+        """
+        Create a simulated scanner (one per distinct spec).
+
+        Args:
+            spec: Scanner setting from the board config
+
+        Returns:
+            SimulatedScanner instance
+        """
+        scanner = SimulatedScanner()
+        self.scanners[spec] = scanner
+        return scanner
+
+    def setup_output(self, pin):
+        """Register an LED pin, initially off."""
+        self.leds[pin] = False
+
+    def output(self, pin, on):
+        """Record an LED pin state."""
+        self.leds[pin] = on
+
+    def cleanup(self):
+        """Turn off all simulated LEDs."""
+        for pin in self.leds:
+            self.leds[pin] = False
+
+
+def create_backend(name):
+    """
+    Create a hardware backend by name.
+
+    Args:
+        name: 'gpio' or 'simulated'
+
+    Returns:
+        Backend instance
+    """
+    if name == 'gpio':
+        return GPIOBackend()
+    if name == 'simulated':
+        return SimulatedBackend()
+    raise ValueError(f"Unknown hardware backend: {name}")
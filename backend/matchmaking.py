@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Matchmaking for Tic-Tac-Toe
+Player identities and a rating-bucketed queue that pairs similar players
+
+Run directly to benchmark pairing throughput:
+    python3 matchmaking.py --players 100000
+    python3 matchmaking.py --spread 0.05 --bucket-size 0.05 --waiting 200000   # crowded queue
+"""
+
+import argparse
+import math
+import random
+import threading
+import time
+import uuid
+
+from config import MATCH_BUCKET_SIZE, MATCH_MAX_SPREAD
+from rating import Rating
+
+
+class Player:
+    """A connected player and their rating."""
+
+    def __init__(self, name, player_id=None, rating=None):
+        """
+        Initialize a player.
+
+        Args:
+            name: Display name
+            player_id: Private identifier, only ever sent to the player
+                (generated if not given)
+            rating: Rating instance (new players start at the default)
+        """
+        self.id = player_id or uuid.uuid4().hex
+        self.public_id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.rating = rating or Rating()
+
+    def to_dict(self):
+        """Serializable form for sending to any client (no private id)."""
+        return {'id': self.public_id, 'name': self.name, **self.rating.to_dict()}
+
+
+class MatchmakingQueue:
+    """
+    Waiting players indexed by rating bucket.
+
+    A player only looks at the buckets within MATCH_MAX_SPREAD of their own
+    rating, so finding an opponent does not depend on how many players are
+    waiting overall.
+
+    Players are paired as soon as anyone within max_spread is waiting, so
+    the queue only grows large when max_spread is small compared to the
+    rating range: with the default settings it holds at most about one
+    player per reachable rating window (a few dozen players in total).
+    Keep bucket_size no larger than max_spread: every player in the own
+    bucket is then a valid opponent, and only the outermost ring needs a
+    per-player range check.
+    """
+
+    def __init__(self, bucket_size=MATCH_BUCKET_SIZE, max_spread=MATCH_MAX_SPREAD):
+        """
+        Initialize an empty queue.
+
+        Args:
+            bucket_size: Rating points covered by each bucket
+            max_spread: Largest rating difference allowed in a match
+        """
+        self.bucket_size = bucket_size
+        self.max_spread = max_spread
+        self.max_offset = math.ceil(max_spread / bucket_size)
+        self.buckets = {}       # bucket index -> {player id: Player}, oldest first
+        self.player_bucket = {}  # player id -> bucket index
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.player_bucket)
+
+    def __contains__(self, player_id):
+        return player_id in self.player_bucket
+
+    def _bucket_index(self, player):
+        return int(player.rating.rating // self.bucket_size)
+
+    def _find_in_bucket(self, index, rating):
+        """Oldest waiting player in a bucket who is within the allowed spread."""
+        for candidate in self.buckets.get(index, {}).values():
+            if abs(candidate.rating.rating - rating) <= self.max_spread:
+                return candidate
+        return None
+
+    def enqueue(self, player):
+        """
+        Add a player, pairing them immediately if an opponent is waiting.
+
+        Args:
+            player: Player to queue
+
+        Returns:
+            Matched opponent (removed from the queue), or None if the player
+            is now waiting
+        """
+        with self._lock:
+            if player.id in self.player_bucket:
+                return None
+
+            index = self._bucket_index(player)
+            rating = player.rating.rating
+
+            # Search outward from the player's own bucket; the first ring with
+            # a suitable candidate holds the closest-rated opponents
+            for offset in range(self.max_offset + 1):
+                candidates = [self._find_in_bucket(i, rating)
+                              for i in {index - offset, index + offset}]
+                candidates = [c for c in candidates if c is not None]
+                if candidates:
+                    opponent = min(candidates, key=lambda c: abs(c.rating.rating - rating))
+                    self._remove(opponent.id)
+                    return opponent
+
+            self.buckets.setdefault(index, {})[player.id] = player
+            self.player_bucket[player.id] = index
+            return None
+
+    def remove(self, player_id):
+        """
+        Remove a waiting player (e.g. on disconnect).
+
+        Args:
+            player_id: Id of the player to remove
+
+        Returns:
+            True if the player was waiting, False otherwise
+        """
+        with self._lock:
+            return self._remove(player_id)
+
+    def _remove(self, player_id):
+        index = self.player_bucket.pop(player_id, None)
+        if index is None:
+            return False
+        bucket = self.buckets[index]
+        del bucket[player_id]
+        if not bucket:
+            del self.buckets[index]
+        return True
+
+
+def simulate(num_players, waiting=0, bucket_size=MATCH_BUCKET_SIZE,
+             max_spread=MATCH_MAX_SPREAD, seed=None):
+    """
+    Benchmark pairing throughput with randomly rated players.
+
+    The queue is first filled with `waiting` players (any that pair up are
+    dropped), then `num_players` more are timed against it. With the default
+    spread the queue stays nearly empty; use a small max_spread to measure
+    lookups against thousands of waiting players.
+
+    Args:
+        num_players: Number of players to time
+        waiting: Number of players queued before timing starts
+        bucket_size: Rating points covered by each bucket
+        max_spread: Largest rating difference allowed in a match
+        seed: Random seed for repeatable runs
+
+    Returns:
+        Dict with benchmark results
+    """
+    rng = random.Random(seed)
+    players = [Player(f"sim-{i}", player_id=str(i),
+                      rating=Rating(rng.gauss(1500, 300)))
+               for i in range(waiting + num_players)]
+    queue = MatchmakingQueue(bucket_size=bucket_size, max_spread=max_spread)
+
+    for player in players[:waiting]:
+        queue.enqueue(player)
+    waiting_before = len(queue)
+
+    gaps = []
+    start = time.perf_counter()
+    for player in players[waiting:]:
+        opponent = queue.enqueue(player)
+        if opponent is not None:
+            gaps.append(abs(player.rating.rating - opponent.rating.rating))
+    elapsed = time.perf_counter() - start
+
+    return {
+        'players': num_players,
+        'waiting_before': waiting_before,
+        'pairs': len(gaps),
+        'waiting': len(queue),
+        'seconds': elapsed,
+        'enqueues_per_second': num_players / elapsed if elapsed else float('inf'),
+        'mean_gap': sum(gaps) / len(gaps) if gaps else 0,
+        'max_gap': max(gaps, default=0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark matchmaking pairing throughput")
+    parser.add_argument('--players', type=int, default=10000, help="players to time")
+    parser.add_argument('--waiting', type=int, default=0,
+                        help="players queued before timing starts")
+    parser.add_argument('--bucket-size', type=float, default=MATCH_BUCKET_SIZE,
+                        help="rating points per bucket")
+    parser.add_argument('--spread', type=float, default=MATCH_MAX_SPREAD,
+                        help="largest rating difference allowed in a match")
+    parser.add_argument('--seed', type=int, default=None, help="random seed")
+    args = parser.parse_args()
+
+    result = simulate(args.players, waiting=args.waiting, bucket_size=args.bucket_size,
+                      max_spread=args.spread, seed=args.seed)
+
+    print("=" * 60)
+    print("Matchmaking Simulation")
+    print("=" * 60)
+    print(f"Waiting at start: {result['waiting_before']}")
+    print(f"Players timed:    {result['players']}")
+    print(f"Pairs formed:     {result['pairs']}")
+    print(f"Still waiting:    {result['waiting']}")
+    print(f"Time:             {result['seconds']:.3f} s")
+    print(f"Throughput:       {result['enqueues_per_second']:,.0f} enqueues/s")
+    print(f"Mean rating gap:  {result['mean_gap']:.1f}")
+    print(f"Max rating gap:   {result['max_gap']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Rating Engines for Tic-Tac-Toe
+Elo and Glicko skill ratings, updated after each finished game
+"""
+
+import math
+
+from config import ELO_K_FACTOR, GLICKO_RD_INFLATION
+
+INITIAL_RATING = 1500
+INITIAL_RD = 350  # Glicko rating deviation for a new player
+
+
+class Rating:
+    """A player's skill rating."""
+
+    def __init__(self, rating=INITIAL_RATING, rd=INITIAL_RD):
+        """
+        Initialize a rating.
+
+        Args:
+            rating: Rating points
+            rd: Rating deviation (only used by Glicko)
+        """
+        self.rating = rating
+        self.rd = rd
+
+    def to_dict(self):
+        """Serializable form for sending to clients."""
+        return {'rating': round(self.rating), 'rd': round(self.rd)}
+
+
+class EloEngine:
+    """Classic Elo with a fixed K-factor."""
+
+    def __init__(self, k_factor=ELO_K_FACTOR):
+        """
+        Initialize the Elo engine.
+
+        Args:
+            k_factor: Maximum rating change per game
+        """
+        self.k_factor = k_factor
+
+    def expected_score(self, a, b):
+        """Expected score of a against b (0-1)."""
+        return 1 / (1 + 10 ** ((b.rating - a.rating) / 400))
+
+    def rate(self, a, b, score_a):
+        """
+        Update both ratings after a game.
+
+        Args:
+            a: Rating of the first player
+            b: Rating of the second player
+            score_a: 1 if a won, 0 if b won, 0.5 for a draw
+
+        Returns:
+            Tuple of new (a, b) ratings
+        """
+        expected_a = self.expected_score(a, b)
+        delta = self.k_factor * (score_a - expected_a)
+        return Rating(a.rating + delta, a.rd), Rating(b.rating - delta, b.rd)
+
+
+class GlickoEngine:
+    """Glicko-1, treating every game as its own rating period."""
+
+    Q = math.log(10) / 400
+
+    def __init__(self, c=GLICKO_RD_INFLATION):
+        """
+        Initialize the Glicko engine.
+
+        Args:
+            c: Rating deviation added back before each rating period
+        """
+        self.c = c
+
+    def _inflate(self, rating):
+        """Uncertainty grows between rating periods, up to INITIAL_RD."""
+        rd = min(math.sqrt(rating.rd ** 2 + self.c ** 2), INITIAL_RD)
+        return Rating(rating.rating, rd)
+
+    def _g(self, rd):
+        return 1 / math.sqrt(1 + 3 * self.Q ** 2 * rd ** 2 / math.pi ** 2)
+
+    def expected_score(self, a, b):
+        """Expected score of a against b (0-1)."""
+        return 1 / (1 + 10 ** (-self._g(b.rd) * (a.rating - b.rating) / 400))
+
+    def _update(self, player, opponent, score):
+        g = self._g(opponent.rd)
+        expected = self.expected_score(player, opponent)
+        d_squared = 1 / (self.Q ** 2 * g ** 2 * expected * (1 - expected))
+        precision = 1 / player.rd ** 2 + 1 / d_squared
+        rating = player.rating + self.Q / precision * g * (score - expected)
+        return Rating(rating, math.sqrt(1 / precision))
+
+    def rate(self, a, b, score_a):
+        """
+        Update both ratings after a game.
+
+        Args:
+            a: Rating of the first player
+            b: Rating of the second player
+            score_a: 1 if a won, 0 if b won, 0.5 for a draw
+
+        Returns:
+            Tuple of new (a, b) ratings
+        """
+        a, b = self._inflate(a), self._inflate(b)
+        return self._update(a, b, score_a), self._update(b, a, 1 - score_a)
+
+
+def create_engine(name):
+    """
+    Create a rating engine by name.
+
+    Args:
+        name: 'elo' or 'glicko'
+
+    Returns:
+        Rating engine instance
+    """
+    if name == 'elo':
+        return EloEngine()
+    if name == 'glicko':
+        return GlickoEngine()
+    raise ValueError(f"Unknown rating engine: {name}")
@@ -0,0 +1,28 @@
+"""
+Shared fixtures for the backend tests
+"""
+
+import time
+
+import pytest
+
+import config
+
+# Never drive real pins from the tests, even when run on a Raspberry Pi.
+# Set before any test module imports gpio_handler or app.
+config.HARDWARE_BACKEND = 'simulated'
+
+
+def _wait_for(condition, timeout=1.0):
+    """Wait until condition() is true or the timeout expires."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.005)
+    return condition()
+
+
+@pytest.fixture
+def wait_for():
+    return _wait_for
@@ -0,0 +1,167 @@
+"""
+Tests for rated matches over Socket.IO
+"""
+
+import pytest
+
+import app as server
+from matchmaking import MatchmakingQueue
+
+
+def received(client, name):
+    """Payloads of every event called name that the client received."""
+    return [event['args'][0] if event['args'] else None
+            for event in client.get_received() if event['name'] == name]
+
+
+def register(client, player_id=None, name='Player'):
+    client.emit('register_player', {'player_id': player_id, 'name': name})
+    return received(client, 'player_info')[-1]
+
+
+@pytest.fixture(autouse=True)
+def fast_results(monkeypatch):
+    monkeypatch.setattr(server, 'RESULT_DISPLAY_TIME', 0)
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    """Each test starts with no players, matches or queued players."""
+    monkeypatch.setattr(server, 'match_queue', MatchmakingQueue())
+    yield
+    with server.state_lock:
+        for state in (server.players, server.client_players, server.player_sids,
+                      server.matches, server.player_rooms, server.detached):
+            state.clear()
+        for room in list(server.games):
+            if room not in server.gpio.rooms:
+                del server.games[room]
+            else:
+                server.games[room].reset_game()
+
+
+@pytest.fixture
+def clients():
+    created = []
+
+    def connect():
+        client = server.socketio.test_client(server.app)
+        created.append(client)
+        return client
+
+    yield connect
+    for client in created:
+        if client.is_connected():
+            client.disconnect()
+
+
+def in_room(player_id, room):
+    sid = server.player_sids[player_id]
+    return (server.client_rooms[sid] == room
+            and room in server.socketio.server.manager.get_rooms(sid, '/'))
+
+
+def test_players_return_to_default_room_after_match(clients, wait_for):
+    alice, bob = clients(), clients()
+    alice_id = register(alice, name='Alice')['player_id']
+    bob_id = register(bob, name='Bob')['player_id']
+
+    alice.emit('find_match')
+    bob.emit('find_match')
+    match = received(alice, 'match_found')[0]
+    room = match['room']
+    assert match['symbol'] == 'X'
+    assert in_room(alice_id, room) and in_room(bob_id, room)
+
+    # X takes the top row
+    for client, position in ((alice, 0), (bob, 3), (alice, 1), (bob, 4), (alice, 2)):
+        client.emit('make_move', {'position': position})
+
+    assert wait_for(lambda: room not in server.games)
+    assert in_room(alice_id, server.DEFAULT_ROOM)
+    assert in_room(bob_id, server.DEFAULT_ROOM)
+    assert server.players[alice_id].rating.rating > server.players[bob_id].rating.rating
+
+
+def test_private_id_is_not_sent_to_opponent(clients):
+    alice, bob = clients(), clients()
+    alice_id = register(alice)['player_id']
+    register(bob)
+
+    alice.emit('find_match')
+    bob.emit('find_match')
+    match = received(bob, 'match_found')[0]
+
+    assert alice_id not in str(match)
+    assert match['players']['X']['id'] == server.players[alice_id].public_id
+
+
+def test_unknown_player_id_is_not_trusted(clients):
+    client = clients()
+    info = register(client, player_id='chosen-by-client')
+    assert info['player_id'] != 'chosen-by-client'
+
+
+def test_closing_an_old_tab_keeps_the_player_queued(clients):
+    tab_a, tab_b, opponent = clients(), clients(), clients()
+    player_id = register(tab_a)['player_id']
+    register(tab_b, player_id=player_id)
+    assert received(tab_a, 'session_replaced') == [None]
+
+    # Tab A no longer owns the player, so closing it changes nothing
+    tab_a.disconnect()
+    tab_b.emit('find_match')
+    assert player_id in server.match_queue
+
+    register(opponent)
+    opponent.emit('find_match')
+    assert received(tab_b, 'match_found')
+    assert received(opponent, 'match_found')
+
+
+def test_player_in_a_match_cannot_queue_from_another_tab(clients):
+    alice, bob = clients(), clients()
+    alice_id = register(alice)['player_id']
+    register(bob)
+    alice.emit('find_match')
+    bob.emit('find_match')
+    room = server.player_rooms[alice_id]
+
+    # The new tab takes over the running match
+    alice_tab = clients()
+    register(alice_tab, player_id=alice_id)
+    assert in_room(alice_id, room)
+
+    alice_tab.emit('find_match')
+    assert received(alice_tab, 'error')
+    assert alice_id not in server.match_queue
+
+
+def test_player_in_a_match_cannot_join_a_board(clients):
+    alice, bob = clients(), clients()
+    alice_id = register(alice)['player_id']
+    register(bob)
+    alice.emit('find_match')
+    bob.emit('find_match')
+    room = server.player_rooms[alice_id]
+
+    alice.emit('join_board', {'room': server.DEFAULT_ROOM})
+    assert received(alice, 'error')
+    assert in_room(alice_id, room)
+
+
+def test_disconnected_players_expire(clients, monkeypatch):
+    client = clients()
+    player_id = register(client)['player_id']
+    client.disconnect()
+    assert player_id in server.players
+
+    # A reload within PLAYER_EXPIRY keeps the player
+    reloaded = clients()
+    assert register(reloaded, player_id=player_id)['player_id'] == player_id
+    reloaded.disconnect()
+
+    monkeypatch.setattr(server, 'PLAYER_EXPIRY', 0)
+    register(clients())
+    assert player_id not in server.players
+    assert player_id not in server.detached
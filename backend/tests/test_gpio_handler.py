@@ -0,0 +1,103 @@
+"""
+Tests for GPIOHandler using the simulated hardware backend
+"""
+
+import pytest
+
+from gpio_handler import GPIOHandler
+from hardware import InputScanner, SimulatedBackend
+
+BOARDS = [
+    {'room': 'board-1', 'scanner': 'gpio',
+     'buttons': {pos: pos for pos in range(9)}, 'leds': {'X': 100, 'O': 101}},
+    {'room': 'board-2', 'scanner': 'gpio',
+     'buttons': {pos: 9 + pos for pos in range(9)}, 'leds': {'X': 102, 'O': 103}},
+    {'room': 'board-3', 'scanner': 'mcp23017:1:0x20',
+     'buttons': {pos: pos for pos in range(9)}, 'leds': {'X': 104, 'O': 105}},
+]
+
+
+@pytest.fixture
+def wait_for_scans(wait_for):
+    def wait(scanner, count=2):
+        """Wait until the poll loop has read the scanner a few more times."""
+        target = scanner.read_count + count
+        assert wait_for(lambda: scanner.read_count >= target)
+    return wait
+
+
+@pytest.fixture
+def presses():
+    return []
+
+
+@pytest.fixture
+def handler(presses):
+    handler = GPIOHandler(lambda room, pos: presses.append((room, pos)),
+                          boards=BOARDS, backend=SimulatedBackend())
+    yield handler
+    handler.cleanup()
+
+
+def test_boards_sharing_a_scanner_share_one_bank(handler):
+    assert sorted(handler.scanners) == ['gpio', 'mcp23017:1:0x20']
+    assert handler.rooms == ['board-1', 'board-2', 'board-3']
+
+
+def test_press_is_dispatched_to_the_right_room(handler, presses, wait_for):
+    scanners = handler.backend.scanners
+    scanners['gpio'].press(13)
+    scanners['mcp23017:1:0x20'].press(8)
+
+    assert wait_for(lambda: len(presses) == 2)
+    assert sorted(presses) == [('board-2', 4), ('board-3', 8)]
+
+
+def test_held_and_bouncing_buttons_are_debounced(handler, presses, wait_for, wait_for_scans):
+    scanner = handler.backend.scanners['gpio']
+    scanner.press(0)
+    assert wait_for(lambda: len(presses) == 1)
+
+    # Holding the button does not repeat the press
+    wait_for_scans(scanner)
+    assert len(presses) == 1
+
+    # A bounce within BUTTON_DEBOUNCE is ignored
+    scanner.release(0)
+    wait_for_scans(scanner)
+    scanner.press(0)
+    wait_for_scans(scanner)
+    assert presses == [('board-1', 0)]
+
+
+def test_line_assigned_twice_is_rejected():
+    boards = [BOARDS[0], {**BOARDS[1], 'buttons': {0: 3}}]
+    with pytest.raises(ValueError, match="assigned twice"):
+        GPIOHandler(boards=boards, backend=SimulatedBackend())
+
+
+def test_turn_indicator_is_per_room(handler):
+    leds = handler.backend.leds
+    handler.set_turn_indicator('board-1', 'X')
+    handler.set_turn_indicator('board-2', 'O')
+
+    assert (leds[100], leds[101]) == (True, False)
+    assert (leds[102], leds[103]) == (False, True)
+    assert (leds[104], leds[105]) == (False, False)
+
+    handler.turn_off_all_leds('board-1')
+    assert (leds[100], leds[101]) == (False, False)
+    assert leds[103] is True
+
+    # Unknown rooms are ignored
+    handler.set_turn_indicator('match-1234', 'X')
+    assert not any(leds[pin] for pin in (100, 101, 104, 105))
+
+
+def test_scanner_without_read_cannot_be_created():
+    class SetupOnlyScanner(InputScanner):
+        def setup(self, pins):
+            pass
+
+    with pytest.raises(TypeError):
+        SetupOnlyScanner()
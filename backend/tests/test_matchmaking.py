@@ -0,0 +1,66 @@
+"""
+Tests for the rating-bucketed matchmaking queue
+"""
+
+from matchmaking import MatchmakingQueue, Player, simulate
+from rating import Rating
+
+
+def make_player(name, rating):
+    return Player(name, rating=Rating(rating))
+
+
+def test_players_within_spread_are_paired():
+    queue = MatchmakingQueue(bucket_size=50, max_spread=200)
+    a = make_player('a', 1500)
+
+    assert queue.enqueue(a) is None
+    assert queue.enqueue(make_player('b', 1690)) is a
+    assert len(queue) == 0
+
+
+def test_max_spread_is_enforced():
+    queue = MatchmakingQueue(bucket_size=50, max_spread=200)
+    queue.enqueue(make_player('a', 1500))
+
+    # 1710 falls in a bucket that is searched, but is out of range
+    assert queue.enqueue(make_player('b', 1710)) is None
+    assert len(queue) == 2
+
+
+def test_closest_ring_is_preferred():
+    queue = MatchmakingQueue(bucket_size=50, max_spread=200)
+    far = make_player('far', 1350)
+    near = make_player('near', 1560)
+    queue.enqueue(far)
+    queue.enqueue(near)
+
+    assert queue.enqueue(make_player('c', 1510)) is near
+    assert far.id in queue
+
+
+def test_remove():
+    queue = MatchmakingQueue()
+    a = make_player('a', 1500)
+    queue.enqueue(a)
+
+    assert queue.remove(a.id) is True
+    assert queue.remove(a.id) is False
+    assert a.id not in queue
+    assert queue.enqueue(make_player('b', 1500)) is None
+
+
+def test_player_is_not_queued_twice():
+    queue = MatchmakingQueue()
+    a = make_player('a', 1500)
+
+    assert queue.enqueue(a) is None
+    assert queue.enqueue(a) is None
+    assert len(queue) == 1
+
+
+def test_simulation_with_crowded_queue():
+    result = simulate(1000, waiting=5000, bucket_size=0.1, max_spread=0.1, seed=1)
+
+    assert result['waiting_before'] > 1000
+    assert result['max_gap'] <= 0.1
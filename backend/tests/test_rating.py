@@ -0,0 +1,54 @@
+"""
+Tests for the Elo and Glicko rating engines
+"""
+
+import pytest
+
+from rating import INITIAL_RD, EloEngine, GlickoEngine, Rating, create_engine
+
+
+def test_elo_update_is_zero_sum():
+    engine = EloEngine(k_factor=32)
+    a, b = engine.rate(Rating(1500), Rating(1600), 1)
+
+    assert a.rating == pytest.approx(1520.48, abs=0.01)
+    assert a.rating + b.rating == pytest.approx(3100)
+
+
+def test_elo_draw_between_equals_changes_nothing():
+    a, b = EloEngine().rate(Rating(1500), Rating(1500), 0.5)
+    assert (a.rating, b.rating) == (1500, 1500)
+
+
+def test_glicko_matches_reference_update():
+    # Single-game update worked by hand from Glickman's Glicko-1 formulas
+    # (c=0, so the RDs going in are used as they are)
+    a, b = GlickoEngine(c=0).rate(Rating(1500, 200), Rating(1400, 30), 1)
+
+    assert a.rating == pytest.approx(1563.4, abs=0.1)
+    assert a.rd == pytest.approx(175.2, abs=0.1)
+    assert b.rating < 1400
+    assert b.rd < 30
+
+
+def test_glicko_rd_grows_between_games():
+    engine = GlickoEngine(c=34.6)
+
+    assert engine._inflate(Rating(1500, 50)).rd == pytest.approx(60.8, abs=0.1)
+    assert engine._inflate(Rating(1500, 349)).rd == INITIAL_RD
+
+
+def test_glicko_rd_settles_instead_of_collapsing():
+    engine = GlickoEngine(c=34.6)
+    a = Rating()
+    for game in range(200):
+        a, _ = engine.rate(a, Rating(1500, a.rd), game % 2)
+
+    # Without the inflation step RD would keep shrinking towards zero
+    assert 100 < a.rd < 120
+
+
+def test_unknown_engine_is_rejected():
+    assert isinstance(create_engine('glicko'), GlickoEngine)
+    with pytest.raises(ValueError):
+        create_engine('trueskill')
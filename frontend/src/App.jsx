@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react'
+import { useState, useEffect, useRef } from 'react'
 import { io } from 'socket.io-client'
 import GameBoard from './components/GameBoard'
 import GameStatus from './components/GameStatus'
@@ -16,6 +16,10 @@ function App() {
     is_draw: false
   })
   const [connected, setConnected] = useState(false)
+  const [player, setPlayer] = useState(null)
+  const [match, setMatch] = useState(null)
+  const [queued, setQueued] = useState(false)
+  const matchRef = useRef(null)
 
   useEffect(() => {
     // Connect to the Flask server
@@ -30,6 +34,18 @@ function App() {
     newSocket.on('connect', () => {
       console.log('Connected to server')
       setConnected(true)
+
+      // Reuse the same player identity across reloads
+      newSocket.emit('register_player', {
+        player_id: localStorage.getItem('playerId'),
+        name: localStorage.getItem('playerName')
+      })
+
+      // Watch a specific board when one is given in the URL (?board=board-2)
+      const board = new URLSearchParams(window.location.search).get('board')
+      if (board) {
+        newSocket.emit('join_board', { room: board })
+      }
     })
 
     newSocket.on('disconnect', () => {
@@ -59,6 +75,39 @@ function App() {
       setGameState(state)
     })
 
+    newSocket.on('player_info', (info) => {
+      localStorage.setItem('playerId', info.player_id)
+      setPlayer(info)
+    })
+
+    newSocket.on('session_replaced', () => {
+      console.log('Player opened in another tab')
+      matchRef.current = null
+      setPlayer(null)
+      setMatch(null)
+      setQueued(false)
+    })
+
+    newSocket.on('queue_joined', () => setQueued(true))
+    newSocket.on('queue_left', () => setQueued(false))
+
+    newSocket.on('match_found', (data) => {
+      console.log('Match found:', data)
+      setQueued(false)
+      matchRef.current = data
+      setMatch(data)
+    })
+
+    newSocket.on('match_ended', (data) => {
+      console.log('Match ended:', data)
+      if (matchRef.current) {
+        const me = data.players[matchRef.current.symbol]
+        setPlayer((current) => ({ ...current, ...me }))
+      }
+      matchRef.current = null
+      setMatch(null)
+    })
+
     newSocket.on('invalid_move', (data) => {
       console.log('Invalid move attempted at position:', data.position)
     })
@@ -76,6 +125,18 @@ function App() {
     }
   }
 
+  const handleFindMatch = () => {
+    if (socket) {
+      socket.emit(queued ? 'leave_queue' : 'find_match')
+    }
+  }
+
+  const handleSquareClick = (position) => {
+    if (socket && match) {
+      socket.emit('make_move', { position })
+    }
+  }
+
   return (
     <div className="App">
       <header className="App-header">
@@ -101,14 +162,32 @@ function App() {
           board={gameState.board}
           winningLine={gameState.winning_line}
           gameOver={gameState.game_over}
+          onSquareClick={match ? handleSquareClick : undefined}
         />
         
-        <button 
-          className="reset-button"
-          onClick={handleReset}
-        >
-          Reset Game
-        </button>
+        {match ? (
+          <div className="match-info">
+            {match.players.X.name} ({match.players.X.rating}) vs {match.players.O.name} ({match.players.O.rating})
+            <br />
+            You are Player {match.symbol}
+          </div>
+        ) : (
+          <button 
+            className="reset-button"
+            onClick={handleReset}
+          >
+            Reset Game
+          </button>
+        )}
+        
+        {player && !match && (
+          <button
+            className="reset-button"
+            onClick={handleFindMatch}
+          >
+            {queued ? 'Cancel Search' : `Find Rated Match (${player.rating})`}
+          </button>
+        )}
         
         <div className="instructions">
           <p>Press the physical buttons on the Raspberry Pi to make your move!</p>
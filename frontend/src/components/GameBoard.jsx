@@ -1,7 +1,7 @@
 import Square from './Square'
 import './GameBoard.css'
 
-function GameBoard({ board, winningLine, gameOver }) {
+function GameBoard({ board, winningLine, gameOver, onSquareClick }) {
   return (
     <div className="game-board">
       {board.map((value, index) => (
@@ -10,6 +10,7 @@ function GameBoard({ board, winningLine, gameOver }) {
           value={value}
           isWinning={winningLine && winningLine.includes(index)}
           gameOver={gameOver}
+          onClick={onSquareClick ? () => onSquareClick(index) : undefined}
         />
       ))}
     </div>
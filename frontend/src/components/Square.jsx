@@ -1,8 +1,11 @@
 import './Square.css'
 
-function Square({ value, isWinning, gameOver }) {
+function Square({ value, isWinning, gameOver, onClick }) {
   return (
-    <div className={`square ${isWinning ? 'winning' : ''} ${value ? 'filled' : ''}`}>
+    <div
+      className={`square ${isWinning ? 'winning' : ''} ${value ? 'filled' : ''}`}
+      onClick={onClick}
+    >
       {value && (
         <span className={`symbol ${value === 'X' ? 'player-x' : 'player-o'}`}>
           {value}